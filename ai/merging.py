@@ -1,8 +1,12 @@
 """
 AI operations for document merging, similarity detection, and other ML tasks.
 """
+import hashlib
 import os
 import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 
@@ -21,8 +25,127 @@ except ImportError:
 # Initialize embedding model
 embeddings = OpenAIEmbeddings(model="text-embedding-3-small", openai_api_key=OPENAI_API_KEY)
 
+# Chat model used for merges; part of the merge cache key
+MERGE_MODEL = "gpt-4o"
 
-def merge_documents_with_ai(main_doc, similar_doc, merged_title=None):
+
+@lru_cache(maxsize=1)
+def _load_merge_prompt():
+    """Read the merge prompt template once per process."""
+    with open("prompts/merge_prompt.txt", "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=1)
+def _get_merge_llm():
+    """Create the chat model used for merges once and reuse it across calls."""
+    return ChatOpenAI(
+        model=MERGE_MODEL, 
+        temperature=0.3,
+        openai_api_key=OPENAI_API_KEY
+    )
+
+
+# Merged output per prompt, so re-running the same merge skips the LLM call
+_MERGE_CACHE_SIZE = 128
+_merge_cache = OrderedDict()
+# Merges run concurrently (request handlers and streaming workers), so every
+# read-and-reorder or write-and-evict on the cache happens under this lock
+_merge_cache_lock = threading.Lock()
+
+
+def _prompt_key(prompt):
+    """Short, stable cache key for a fully rendered merge prompt and the model answering it."""
+    return hashlib.blake2b(f"{MERGE_MODEL}\0{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _lookup_merge(cache_key):
+    """Return the cached merge result for this key, or None on a miss."""
+    with _merge_cache_lock:
+        merged_content = _merge_cache.get(cache_key)
+        if merged_content is not None:
+            _merge_cache.move_to_end(cache_key)
+        return merged_content
+
+
+def clear_merge_cache():
+    """Forget all cached merge results."""
+    with _merge_cache_lock:
+        _merge_cache.clear()
+
+
+def warm_up():
+    """
+    Load the merge prompt and construct the chat client ahead of the first merge,
+    so the first user-facing merge does not pay for them.
+    """
+    _load_merge_prompt()
+    _get_merge_llm()
+
+
+def _document_fields(doc, default_title):
+    """
+    Normalize a document object or plain string to (title, url, content).
+    
+    Args:
+        doc: Object with page_content/metadata OR string
+        default_title: Title to use when doc is a plain string
+        
+    Returns:
+        tuple: (title, url, content)
+    """
+    page_content = getattr(doc, 'page_content', None)
+    if page_content is None:
+        # Simple string
+        return default_title, "No URL", str(doc)
+    
+    # Document object
+    metadata = doc.metadata
+    return metadata.get("title", "Untitled"), metadata.get("source", "No URL"), page_content
+
+
+def _build_merge_prompt(main_doc, similar_doc, merged_title=None):
+    """
+    Render the merge prompt template for two documents.
+    
+    Args:
+        main_doc: Primary document (object with page_content/metadata OR string)
+        similar_doc: Similar document (object with page_content/metadata OR string)
+        merged_title: Optional title for the merged document
+        
+    Returns:
+        str: The prompt to send to the model
+    """
+    # Handle both document objects and simple strings
+    title_a, url_a, content_a = _document_fields(main_doc, merged_title or "Document A")
+    title_b, url_b, content_b = _document_fields(similar_doc, merged_title or "Document B")
+    
+    # Read the prompt template
+    prompt_template = _load_merge_prompt()
+    
+    # Replace placeholders
+    prompt = prompt_template.replace("{{title_a}}", title_a)
+    prompt = prompt.replace("{{title_b}}", title_b)
+    prompt = prompt.replace("{{url_a}}", url_a)
+    prompt = prompt.replace("{{url_b}}", url_b)
+    prompt = prompt.replace("{{content_a}}", content_a)
+    prompt = prompt.replace("{{content_b}}", content_b)
+    return prompt
+
+
+def _remember_merge(cache_key, merged_content):
+    """Store a merge result, evicting the least recently used one when full."""
+    # An empty completion is not a merge; let the next request ask the model again
+    if not merged_content or not merged_content.strip():
+        return
+    with _merge_cache_lock:
+        _merge_cache[cache_key] = merged_content
+        _merge_cache.move_to_end(cache_key)
+        if len(_merge_cache) > _MERGE_CACHE_SIZE:
+            _merge_cache.popitem(last=False)
+
+
+def merge_documents_with_ai(main_doc, similar_doc, merged_title=None, use_cache=True):
     """
     Merge two similar documents using AI to create a combined document
     that preserves the most important information from both.
@@ -31,59 +154,67 @@ def merge_documents_with_ai(main_doc, similar_doc, merged_title=None):
         main_doc: Primary document (object with page_content/metadata OR string)
         similar_doc: Similar document to merge (object with page_content/metadata OR string)
         merged_title: Optional title for the merged document
+        use_cache: Reuse a previous result for identical inputs; pass False to regenerate
         
     Returns:
         str: The merged document content
     """
     try:
-        # Handle both document objects and simple strings
-        if hasattr(main_doc, 'page_content'):
-            # Document object
-            title_a = main_doc.metadata.get("title", "Untitled")
-            url_a = main_doc.metadata.get("source", "No URL")
-            content_a = main_doc.page_content
-        else:
-            # Simple string
-            title_a = merged_title or "Document A"
-            url_a = "No URL"
-            content_a = str(main_doc)
-        
-        if hasattr(similar_doc, 'page_content'):
-            # Document object
-            title_b = similar_doc.metadata.get("title", "Untitled")
-            url_b = similar_doc.metadata.get("source", "No URL")
-            content_b = similar_doc.page_content
-        else:
-            # Simple string
-            title_b = merged_title or "Document B"
-            url_b = "No URL"
-            content_b = str(similar_doc)
+        prompt = _build_merge_prompt(main_doc, similar_doc, merged_title)
         
-        # Read the prompt template
-        with open("prompts/merge_prompt.txt", "r", encoding="utf-8") as f:
-            prompt_template = f.read()
-        
-        # Replace placeholders
-        prompt = prompt_template.replace("{{title_a}}", title_a)
-        prompt = prompt.replace("{{title_b}}", title_b)
-        prompt = prompt.replace("{{url_a}}", url_a)
-        prompt = prompt.replace("{{url_b}}", url_b)
-        prompt = prompt.replace("{{content_a}}", content_a)
-        prompt = prompt.replace("{{content_b}}", content_b)
+        # The prompt covers titles, URLs and contents, so it identifies the merge
+        cache_key = _prompt_key(prompt)
+        if use_cache:
+            cached = _lookup_merge(cache_key)
+            if cached is not None:
+                return cached
         
         # Call OpenAI
-        llm = ChatOpenAI(
-            model="gpt-4o", 
-            temperature=0.3,
-            openai_api_key=OPENAI_API_KEY
-        )
-        result = llm.invoke(prompt)
+        result = _get_merge_llm().invoke(prompt)
+        
+        _remember_merge(cache_key, result.content)
         
         return result.content
     except Exception as e:
         return f"Error during merge: {str(e)}"
 
 
+def stream_merge_documents_with_ai(main_doc, similar_doc, merged_title=None, use_cache=True):
+    """
+    Same as merge_documents_with_ai, but yields the merged content in chunks as
+    the model produces them, so callers can show output before the merge finishes.
+    
+    Args:
+        main_doc: Primary document (object with page_content/metadata OR string)
+        similar_doc: Similar document to merge (object with page_content/metadata OR string)
+        merged_title: Optional title for the merged document
+        use_cache: Reuse a previous result for identical inputs; pass False to regenerate
+        
+    Yields:
+        str: Successive pieces of the merged document content
+    """
+    try:
+        prompt = _build_merge_prompt(main_doc, similar_doc, merged_title)
+        
+        cache_key = _prompt_key(prompt)
+        if use_cache:
+            cached = _lookup_merge(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        chunks = []
+        for chunk in _get_merge_llm().stream(prompt):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield chunk.content
+        
+        # Only a complete generation is worth reusing
+        _remember_merge(cache_key, "".join(chunks))
+    except Exception as e:
+        yield f"Error during merge: {str(e)}"
+
+
 def calculate_document_similarity(doc1_embedding, doc2_embedding):
     """
     Calculate cosine similarity between two document embeddings
@@ -1,6 +1,7 @@
 """
 Confluence API operations for Concatly.
 """
+import re
 import requests
 import json
 import sys
@@ -161,26 +162,28 @@ def get_available_spaces(user_credentials=None):
         return []
 
 
+# URL shapes that carry a page ID, in the order they are tried
+_PAGE_ID_PATTERNS = (
+    re.compile(r'pageId=([^&]*)'),                  # Standard viewpage.action URL
+    re.compile(r'/pages/([^/]*)'),                  # Modern URL: /wiki/spaces/SPACE/pages/123456/Page+Title
+    re.compile(r'/rest/api/content/([^?/]*)'),      # API content URL: /rest/api/content/123456
+)
+_SPACE_KEY_PATTERN = re.compile(r'/wiki/spaces/([^/]*)')
+
+
 def extract_space_key_from_url(url):
     """Extract space key from Confluence URL"""
     if not url:
         return None
     
-    try:
-        # Modern Confluence URLs: https://domain.atlassian.net/wiki/spaces/SPACE_KEY/pages/...
-        if '/wiki/spaces/' in url:
-            parts = url.split('/wiki/spaces/')
-            if len(parts) > 1:
-                space_key = parts[1].split('/')[0]
-                logger.info(f"✅ Extracted space key from URL: {space_key}")
-                return space_key
-        
-        logger.warning(f"⚠️ Could not extract space key from URL: {url}")
-        return None
-        
-    except Exception as e:
-        logger.error(f"❌ Error extracting space key from URL: {e}")
-        return None
+    # Modern Confluence URLs: https://domain.atlassian.net/wiki/spaces/SPACE_KEY/pages/...
+    match = _SPACE_KEY_PATTERN.search(url)
+    if match:
+        logger.debug(f"✅ Extracted space key from URL: {match.group(1)}")
+        return match.group(1)
+    
+    logger.warning(f"⚠️ Could not extract space key from URL: {url}")
+    return None
 
 
 def extract_page_id_from_url(url):
@@ -189,41 +192,14 @@ def extract_page_id_from_url(url):
         logger.warning("⚠️ No URL provided for page ID extraction")
         return None
     
-    logger.info(f"🔍 Extracting page ID from URL: {url}")
+    for pattern in _PAGE_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            logger.debug(f"✅ Found page ID in URL: {match.group(1)}")
+            return match.group(1)
     
-    try:
-        # Method 1: Standard viewpage.action URL
-        if 'pageId=' in url:
-            page_id = url.split('pageId=')[1].split('&')[0]
-            logger.info(f"✅ Found pageId in URL: {page_id}")
-            return page_id
-        
-        # Method 2: Modern Confluence URLs with /pages/
-        if '/pages/' in url:
-            # URL format: https://domain.atlassian.net/wiki/spaces/SPACE/pages/123456/Page+Title
-            parts = url.split('/pages/')
-            if len(parts) > 1:
-                page_id = parts[1].split('/')[0]
-                logger.info(f"✅ Extracted page ID from modern URL: {page_id}")
-                return page_id
-                logger.debug(f"✅ Found page ID in modern URL: {page_id}")
-                return page_id
-        
-        # Method 3: API content URL
-        if '/rest/api/content/' in url:
-            # URL format: https://domain.atlassian.net/rest/api/content/123456
-            parts = url.split('/rest/api/content/')
-            if len(parts) > 1:
-                page_id = parts[1].split('?')[0].split('/')[0]
-                logger.debug(f"✅ Found page ID in API URL: {page_id}")
-                return page_id
-        
-        logger.warning(f"⚠️ No page ID found in URL format: {url}")
-        return None
-        
-    except Exception as e:
-        logger.error(f"❌ Error extracting page ID from {url}: {e}")
-        return None
+    logger.warning(f"⚠️ No page ID found in URL format: {url}")
+    return None
 
 
 def apply_merge_to_confluence(main_doc, similar_doc, merged_content, keep_main=True, user_credentials=None):
@@ -395,13 +371,17 @@ def cleanup_orphaned_chroma_records(user_credentials=None):
         from models.database import get_document_database
         import requests
         
-        # Get database and all current records
+        # Get database and all current records (metadata is all we need here)
         db = get_document_database()
-        all_docs = db.get()
+        all_docs = db.get(include=['metadatas'])
         
         doc_ids = all_docs.get('ids', [])
         metadatas = all_docs.get('metadatas', [])
         
+        # Resolve credentials once instead of once per page
+        base_url = get_confluence_base_url(user_credentials)
+        auth = get_confluence_auth(user_credentials)
+        
         orphaned_ids = []
         
         for i, doc_id in enumerate(doc_ids):
@@ -419,8 +399,8 @@ def cleanup_orphaned_chroma_records(user_credentials=None):
             if page_id:
                 # Check if the page still exists in Confluence
                 try:
-                    check_url = f"{get_confluence_base_url(user_credentials)}/rest/api/content/{page_id}"
-                    response = requests.get(check_url, auth=get_confluence_auth(user_credentials))
+                    check_url = f"{base_url}/rest/api/content/{page_id}"
+                    response = requests.get(check_url, auth=auth, timeout=10)
                     
                     if response.status_code == 404:
                         # Page doesn't exist, mark for deletion
@@ -102,7 +102,8 @@ def store_merge_operation(kept_page_id, deleted_page_id, merged_content, kept_ti
             try:
                 with open(merge_file, 'r') as f:
                     merge_operations = json.load(f)
-            except:
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: could not read {merge_file}, starting a new merge history: {str(e)}")
                 merge_operations = []
         
         # Add new operation
@@ -632,9 +633,12 @@ def update_chroma_after_merge(main_doc, similar_doc, keep_main=True):
         # Find and update documents that reference the removed document
         updated_count = 0
         documents_to_update = []
+        remove_chroma_id = None  # Chroma ID of the removed document, found in the same pass
         
         for i, metadata in enumerate(all_docs['metadatas']):
             doc_id = metadata.get('doc_id', '')
+            if remove_chroma_id is None and doc_id == remove_doc_id:
+                remove_chroma_id = all_docs['ids'][i]
             similar_docs_str = metadata.get('similar_docs', '')
             
             if similar_docs_str and remove_doc_id in similar_docs_str:
@@ -674,13 +678,6 @@ def update_chroma_after_merge(main_doc, similar_doc, keep_main=True):
                 return False, f"Error updating documents: {str(e)}"
         
         # Remove the deleted document from Chroma entirely
-        # Find the Chroma ID of the document to remove
-        remove_chroma_id = None
-        for i, metadata in enumerate(all_docs['metadatas']):
-            if metadata.get('doc_id', '') == remove_doc_id:
-                remove_chroma_id = all_docs['ids'][i]
-                break
-        
         if remove_chroma_id:
             db.delete([remove_chroma_id])
             print(f"DEBUG: Removed document {remove_doc_id} from Chroma database")
@@ -5,7 +5,9 @@ Extracted from Streamlit app for containerized deployment.
 import os
 import requests
 import hashlib
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 from datetime import datetime, timezone
 from langchain_community.document_loaders import ConfluenceLoader
 from langchain.schema import Document
@@ -17,6 +19,11 @@ class ConfluenceService:
     Handles authentication, space discovery, page loading, and content processing.
     """
     
+    # Space lists shared across instances (one is created per request), keyed by
+    # (base URL, username, token digest) and kept for SPACES_CACHE_TTL seconds
+    SPACES_CACHE_TTL = 300
+    _spaces_cache: Dict[Tuple[str, str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+    
     def __init__(self, base_url: str, username: str, api_token: str):
         """
         Initialize Confluence service with credentials.
@@ -56,27 +63,68 @@ class ConfluenceService:
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
     
-    def get_all_accessible_spaces(self) -> Tuple[bool, List[Dict[str, Any]], str]:
+    def _get_all_results(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[requests.Response]]:
+        """
+        Collect every result of a paged Confluence REST listing by following its
+        `_links.next` continuation link over one reused connection.
+        
+        Args:
+            url: First page URL
+            params: Query parameters for the first page (later links carry their own)
+            
+        Returns:
+            Tuple of (results, None) on success, or (results so far, failed response)
+        """
+        results = []
+        with requests.Session() as session:
+            session.auth = self.auth
+            while url:
+                response = session.get(url, params=params, timeout=30)
+                if response.status_code != 200:
+                    return results, response
+                
+                data = response.json()
+                results.extend(data.get('results', []))
+                
+                links = data.get('_links', {})
+                next_link = links.get('next')
+                if not next_link:
+                    break
+                # The next link is relative to the configured base URL
+                url = next_link if next_link.startswith('http') else f"{self.base_url}{next_link}"
+                params = None
+        return results, None
+    
+    def _spaces_cache_key(self) -> Tuple[str, str, str]:
+        """Cache key for this connection; the token is hashed so bad credentials never share an entry."""
+        return (self.base_url, self.username, hashlib.sha256(self.api_token.encode()).hexdigest())
+    
+    def get_all_accessible_spaces(self, force_refresh: bool = False) -> Tuple[bool, List[Dict[str, Any]], str]:
         """
         Get all Confluence spaces accessible to the authenticated user.
         
+        Args:
+            force_refresh: Ignore any cached list and fetch from Confluence
+        
         Returns:
             Tuple of (success, spaces_list, message)
         """
         try:
+            cache_key = self._spaces_cache_key()
+            cached = self._spaces_cache.get(cache_key)
+            if cached and not force_refresh and time.monotonic() - cached[0] < self.SPACES_CACHE_TTL:
+                return True, list(cached[1]), f"Found {len(cached[1])} accessible spaces (cached)"
+            
             url = f"{self.base_url}/rest/api/space"
             params = {
-                "limit": 200,  # Get up to 200 spaces
+                "limit": 200,  # Spaces per page
                 "expand": "description.plain,description.view"
             }
             
-            response = requests.get(url, auth=self.auth, params=params)
-            
-            if response.status_code != 200:
-                return False, [], f"Failed to fetch spaces: {response.status_code} - {response.text}"
+            spaces, failed_response = self._get_all_results(url, params)
             
-            data = response.json()
-            spaces = data.get('results', [])
+            if failed_response is not None:
+                return False, [], f"Failed to fetch spaces: {failed_response.status_code} - {failed_response.text}"
             
             # Format spaces for consistent output
             formatted_spaces = []
@@ -109,8 +157,10 @@ class ConfluenceService:
             # Sort by space name
             formatted_spaces.sort(key=lambda x: x['name'].lower())
             
+            self._spaces_cache[cache_key] = (time.monotonic(), formatted_spaces)
+            
             message = f"Found {len(formatted_spaces)} accessible spaces"
-            return True, formatted_spaces, message
+            return True, list(formatted_spaces), message
             
         except Exception as e:
             return False, [], f"Error fetching spaces: {str(e)}"
@@ -135,61 +185,14 @@ class ConfluenceService:
             spaces_processed = 0
             errors = []
             
-            for space_key in space_keys:
-                try:
-                    print(f"Loading documents from space {space_key}...")
-                    
-                    # Use ConfluenceLoader for efficient document loading
-                    # Only pass limit if it's not None to avoid comparison issues
-                    loader_kwargs = {
-                        'url': self.base_url,
-                        'username': self.username,
-                        'api_key': self.api_token,
-                        'space_key': space_key,
-                        'include_attachments': False
-                    }
-                    
-                    # Only add limit if it's specified (not None)
-                    if limit_per_space is not None:
-                        loader_kwargs['limit'] = limit_per_space
-                    
-                    loader = ConfluenceLoader(**loader_kwargs)
-                    
-                    documents = loader.load()
-                    print(f"Loaded {len(documents)} documents from space {space_key}")
-                    
-                    # Process and enhance document metadata
-                    for doc in documents:
-                        # Extract page ID from URL for unique identification
-                        page_id = self._extract_page_id_from_url(doc.metadata.get('source', ''))
-                        if page_id:
-                            doc_id = f"page_{page_id}"
-                        else:
-                            # Fallback to hash-based ID
-                            title = doc.metadata.get('title', 'untitled')
-                            doc_id = f"doc_{hashlib.md5(title.encode()).hexdigest()[:8]}"
-                        
-                        # Get the actual space name from space key
-                        space_name = self.get_space_name_from_key(space_key)
-                        
-                        # Enhance metadata with both space key and space name
-                        doc.metadata.update({
-                            'space_key': space_key,
-                            'space_name': space_name,  # Now using actual space name
-                            'doc_id': doc_id,
-                            'processed_at': datetime.now(timezone.utc).isoformat(),
-                            'content_length': len(doc.page_content)
-                        })
-                    
-                    all_documents.extend(documents)
-                    total_loaded += len(documents)
-                    spaces_processed += 1
-                    
-                except Exception as e:
-                    error_msg = f"Error loading from space {space_key}: {str(e)}"
-                    errors.append(error_msg)
-                    print(f"ERROR: {error_msg}")
+            for space_key, documents, error in self.iter_pages_from_spaces(space_keys, limit_per_space):
+                if error:
+                    errors.append(error)
                     continue
+                
+                all_documents.extend(documents)
+                total_loaded += len(documents)
+                spaces_processed += 1
             
             # Prepare result message
             if errors:
@@ -204,6 +207,104 @@ class ConfluenceService:
         except Exception as e:
             return False, [], f"Error during document loading: {str(e)}"
     
+    def iter_pages_from_spaces(self, space_keys: List[str], limit_per_space: Optional[int] = None) -> Iterator[Tuple[str, List[Document], Optional[str]]]:
+        """
+        Load pages space by space, yielding each space as soon as it is ready.
+        
+        The next space is fetched in the background while the caller handles the
+        current one, so indexing a space overlaps with downloading the next.
+        
+        Args:
+            space_keys: List of space keys to load from
+            limit_per_space: Optional limit per space (None for no limit)
+            
+        Yields:
+            Tuple of (space_key, documents, error) - error is None on success
+        """
+        if not space_keys:
+            return
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._load_space_pages, space_keys[0], limit_per_space)
+            
+            try:
+                for index, space_key in enumerate(space_keys):
+                    future = pending
+                    if index + 1 < len(space_keys):
+                        pending = executor.submit(self._load_space_pages, space_keys[index + 1], limit_per_space)
+                    
+                    try:
+                        documents = future.result()
+                    except Exception as e:
+                        error_msg = f"Error loading from space {space_key}: {str(e)}"
+                        print(f"ERROR: {error_msg}")
+                        yield space_key, [], error_msg
+                        continue
+                    
+                    yield space_key, documents, None
+            finally:
+                # Closed early: drop the prefetch if it hasn't started yet
+                pending.cancel()
+    
+    def _load_space_pages(self, space_key: str, limit_per_space: Optional[int] = None) -> List[Document]:
+        """
+        Load and annotate every page of one space.
+        
+        Args:
+            space_key: Space key to load from
+            limit_per_space: Optional limit (None for no limit)
+            
+        Returns:
+            List of documents with space, ID and processing metadata
+        """
+        print(f"Loading documents from space {space_key}...")
+        
+        # Use ConfluenceLoader for efficient document loading
+        # Only pass limit if it's not None to avoid comparison issues
+        loader_kwargs = {
+            'url': self.base_url,
+            'username': self.username,
+            'api_key': self.api_token,
+            'space_key': space_key,
+            'include_attachments': False
+        }
+        
+        # Only add limit if it's specified (not None)
+        if limit_per_space is not None:
+            loader_kwargs['limit'] = limit_per_space
+        
+        loader = ConfluenceLoader(**loader_kwargs)
+        
+        documents = loader.load()
+        print(f"Loaded {len(documents)} documents from space {space_key}")
+        
+        # Every document in this batch belongs to the same space, so resolve
+        # its name (an HTTP round-trip) and the processing timestamp once
+        space_name = self.get_space_name_from_key(space_key)
+        processed_at = datetime.now(timezone.utc).isoformat()
+        
+        # Process and enhance document metadata
+        for doc in documents:
+            # Extract page ID from URL for unique identification
+            page_id = self._extract_page_id_from_url(doc.metadata.get('source', ''))
+            if page_id:
+                doc_id = f"page_{page_id}"
+            else:
+                # Fallback to hash-based ID
+                title = doc.metadata.get('title', 'untitled')
+                doc_id = f"doc_{hashlib.md5(title.encode()).hexdigest()[:8]}"
+            
+            # Enhance metadata with both space key and space name
+            doc.metadata.update({
+                'space_key': space_key,
+                'space_name': space_name,  # Now using actual space name
+                'doc_id': doc_id,
+                'processed_at': processed_at,
+                'content_length': len(doc.page_content)
+            })
+        
+        return documents
+    
     def get_space_name_from_key(self, space_key: str) -> str:
         """
         Get space name from space key.
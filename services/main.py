@@ -18,13 +18,16 @@ and genera    try:
         
         logger.info("🗄️ Initializing vector store service from environment...")mbeddings.
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import os
 import asyncio
+import threading
 import time
+import traceback
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
@@ -36,41 +39,63 @@ from .confluence_service import ConfluenceService, ConfluenceConfig
 from .vector_store_service import VectorStoreService, VectorStoreConfig
 
 # Import logging
+import atexit
 import logging
-
-# Configure basic logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+import logging.handlers
+import queue
+
+# Configure logging: QueueHandler renders the message in the calling thread and
+# enqueues the record; a background listener thread applies the console format
+# and does the writes. Skip setup if it already ran (e.g. the module imported
+# under both "main" and "services.main") so a second listener isn't started.
+if not any(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers):
+    _log_queue = queue.Queue(-1)
+    _console_handler = logging.StreamHandler()
+    _console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s | %(levelname)-8s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    _log_listener = logging.handlers.QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+    _queue_handler = logging.handlers.QueueHandler(_log_queue)
+    # QueueHandler pre-formats the message; keep it bare so the console formatter adds the prefix once
+    _queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 
 # Initialize logger
 logger = logging.getLogger("main")
 
 # Define logging helper functions
 def log_startup(message):
-    logger.info(f"🚀 {message}")
+    logger.info("🚀 %s", message)
 
 def log_shutdown(message):
-    logger.info(f"🛑 {message}")
+    logger.info("🛑 %s", message)
+
+def _format_extra(kwargs):
+    return " | " + " | ".join(f"{k}: {v}" for k, v in kwargs.items()) if kwargs else ""
 
 def log_api_request(endpoint, method="", **kwargs):
-    extra_info = " | ".join([f"{k}: {v}" for k, v in kwargs.items()]) if kwargs else ""
-    logger.info(f"📨 API {method} {endpoint}{' | ' + extra_info if extra_info else ''}")
+    # Skip building the kwargs summary when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("📨 API %s %s%s", method, endpoint, _format_extra(kwargs))
 
 def log_api_response(logger_param, endpoint, status_code, duration_ms=None, **kwargs):
+    if not logger.isEnabledFor(logging.INFO):
+        return
     duration_info = f" | {duration_ms:.1f}ms" if duration_ms else ""
-    extra_info = " | ".join([f"{k}: {v}" for k, v in kwargs.items()]) if kwargs else ""
     status_emoji = "✅" if status_code < 400 else "❌"
-    logger.info(f"{status_emoji} API {endpoint} → {status_code}{duration_info}{' | ' + extra_info if extra_info else ''}")
+    logger.info("%s API %s → %s%s%s", status_emoji, endpoint, status_code, duration_info, _format_extra(kwargs))
 
 def log_error_with_context(logger_param, error, context="", **kwargs):
-    import traceback
     context_info = f" | Context: {context}" if context else ""
-    extra_info = " | ".join([f"{k}: {v}" for k, v in kwargs.items()]) if kwargs else ""
-    logger.error(f"💥 ERROR: {str(error)}{context_info}{' | ' + extra_info if extra_info else ''}")
-    logger.debug(f"🔍 Full traceback:\n{traceback.format_exc()}")
+    logger.error("💥 ERROR: %s%s%s", error, context_info, _format_extra(kwargs))
+    # Let the logging machinery format the traceback (cached on the record
+    # as exc_text) and only when DEBUG is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Full traceback:", exc_info=True)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -99,6 +124,8 @@ vector_store_service: Optional[VectorStoreService] = None
 
 # Organization-specific vector store services cache
 organization_vector_stores: Dict[str, VectorStoreService] = {}
+# Guards first-time creation so concurrent callers don't each build a service
+_vector_store_lock = threading.Lock()
 
 # In-memory status tracking
 processing_status = {}
@@ -119,18 +146,25 @@ def get_vector_store_for_organization(organization_id: Optional[str] = None) ->
     # If no organization_id provided, use global service (for backward compatibility)
     if not organization_id:
         if vector_store_service is None:
-            print("🔄 [VECTOR_STORE] Creating global vector store service...")
-            vector_store_service = VectorStoreConfig.create_service_from_env()
+            with _vector_store_lock:
+                # Re-check: another thread may have created it while we waited
+                if vector_store_service is None:
+                    print("🔄 [VECTOR_STORE] Creating global vector store service...")
+                    vector_store_service = VectorStoreConfig.create_service_from_env()
         return vector_store_service
     
-    # Check if we already have a service for this organization
-    if organization_id in organization_vector_stores:
-        return organization_vector_stores[organization_id]
+    # Check if we already have a service for this organization (lock-free fast path)
+    org_service = organization_vector_stores.get(organization_id)
+    if org_service is not None:
+        return org_service
     
-    # Create new organization-specific service
-    print(f"🔄 [VECTOR_STORE] Creating vector store service for organization: {organization_id}")
-    org_service = VectorStoreConfig.create_service_from_env(organization_id)
-    organization_vector_stores[organization_id] = org_service
+    with _vector_store_lock:
+        org_service = organization_vector_stores.get(organization_id)
+        if org_service is None:
+            # Create new organization-specific service
+            print(f"🔄 [VECTOR_STORE] Creating vector store service for organization: {organization_id}")
+            org_service = VectorStoreConfig.create_service_from_env(organization_id)
+            organization_vector_stores[organization_id] = org_service
     
     return org_service
 
@@ -187,6 +221,7 @@ class MergeRequest(BaseModel):
     """Request to merge two documents."""
     pair_id: int = Field(..., description="ID of the duplicate pair to merge")
     organization_id: Optional[str] = Field(None, description="Organization ID for data isolation")
+    regenerate: bool = Field(False, description="Bypass the cached merge result and call the AI again")
 
 
 class ApplyMergeRequest(BaseModel):
@@ -199,6 +234,17 @@ class ApplyMergeRequest(BaseModel):
 
 
 # Startup event
+def prewarm_merge_dependencies():
+    """Import the merge/Confluence modules and build the LLM client off the request path."""
+    try:
+        from ai.merging import warm_up
+        import confluence.api
+        warm_up()
+        logger.info("🔥 Merge dependencies prewarmed")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not prewarm merge dependencies (will load on first merge): {e}")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
@@ -207,10 +253,17 @@ async def startup_event():
     # Log startup
     log_startup("main")
     
+    # Load the merge stack in the background so startup is not delayed by it
+    threading.Thread(target=prewarm_merge_dependencies, name="prewarm-merge", daemon=True).start()
+    
     try:
-        logger.info("� Environment check - OpenAI API Key: ✅ Set" if os.getenv('OPENAI_API_KEY') else "🔑 Environment check - OpenAI API Key: ❌ Missing")
-        logger.info(f"�️ Environment check - ChromaDB persist dir: {os.getenv('CHROMA_PERSIST_DIRECTORY', './chroma_store')}")
-        logger.info(f"� Current working directory: {os.getcwd()}")
+        # One record for the whole environment check instead of three
+        logger.info(
+            "🔑 Environment check - OpenAI API Key: %s | ChromaDB persist dir: %s | Working directory: %s",
+            "✅ Set" if os.getenv('OPENAI_API_KEY') else "❌ Missing",
+            os.getenv('CHROMA_PERSIST_DIRECTORY', './chroma_store'),
+            os.getcwd()
+        )
         
         logger.info("🗄️ Initializing vector store service from environment...")
         # Initialize vector store service from environment
@@ -239,7 +292,6 @@ async def startup_event():
 @app.options("/{path:path}")
 async def options_handler(path: str):
     """Handle CORS preflight requests"""
-    from fastapi import Response
     return Response(status_code=200)
 
 # Simple ping endpoint for ALB health checks
@@ -324,8 +376,8 @@ async def test_connection(credentials: ConfluenceCredentials):
 
 # Get available spaces
 @app.post("/spaces")
-async def get_spaces(credentials: ConfluenceCredentials) -> List[SpaceInfo]:
-    """Get all accessible Confluence spaces."""
+async def get_spaces(credentials: ConfluenceCredentials, refresh: bool = False) -> List[SpaceInfo]:
+    """Get all accessible Confluence spaces. Pass refresh=true to bypass the short-lived cache."""
     try:
         # Create Confluence service
         confluence = ConfluenceService(
@@ -335,7 +387,7 @@ async def get_spaces(credentials: ConfluenceCredentials) -> List[SpaceInfo]:
         )
         
         # Get spaces
-        success, spaces, message = confluence.get_all_accessible_spaces()
+        success, spaces, message = confluence.get_all_accessible_spaces(force_refresh=refresh)
         
         if not success:
             raise HTTPException(status_code=400, detail=message)
@@ -353,6 +405,10 @@ async def get_spaces(credentials: ConfluenceCredentials) -> List[SpaceInfo]:
 async def process_documents(request: ProcessingRequest, background_tasks: BackgroundTasks):
     """Start document processing from Confluence spaces."""
     try:
+        # Nothing to load - don't spin up a background run just to finish empty
+        if not request.space_keys:
+            raise HTTPException(status_code=400, detail="At least one space key is required")
+        
         # Generate processing ID
         processing_id = f"proc_{int(datetime.now(timezone.utc).timestamp())}"
         
@@ -379,6 +435,8 @@ async def process_documents(request: ProcessingRequest, background_tasks: Backgr
             "message": f"Document processing started for {len(request.space_keys)} spaces"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start processing: {str(e)}")
 
@@ -451,7 +509,6 @@ async def get_connection_status_for_org(request: ConnectionStatusRequest) -> Con
     except Exception as e:
         print(f"💥 [CONNECTION-STATUS] Error getting status: {e}")
         print(f"💥 [CONNECTION-STATUS] Error type: {type(e).__name__}")
-        import traceback
         print(f"💥 [CONNECTION-STATUS] Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Failed to get status: {str(e)}")
 
@@ -495,8 +552,14 @@ async def scan_duplicates_manual(request: ConnectionStatusRequest):
 
 
 @app.get("/duplicates")
-async def get_duplicates(organization_id: Optional[str] = None) -> List[DuplicatePair]:
-    """Get all detected duplicate document pairs for organization."""
+async def get_duplicates(organization_id: Optional[str] = None, offset: int = 0, limit: Optional[int] = None,
+                         min_similarity: Optional[float] = None) -> List[DuplicatePair]:
+    """
+    Get detected duplicate document pairs for organization.
+    
+    Pass offset/limit to fetch one page at a time; by default every pair is returned.
+    Pass min_similarity to leave out pairs scoring below it.
+    """
     try:
         # Get organization-specific vector store
         org_vector_store = get_vector_store_for_organization(organization_id)
@@ -504,8 +567,14 @@ async def get_duplicates(organization_id: Optional[str] = None) -> List[Duplicat
         if not org_vector_store:
             raise HTTPException(status_code=400, detail="Vector store not initialized")
         
-        duplicates = org_vector_store.get_duplicates()
-        return [DuplicatePair(**dup) for dup in duplicates]
+        if offset < 0 or (limit is not None and limit < 1):
+            raise HTTPException(status_code=400, detail="offset must be >= 0 and limit must be >= 1")
+        
+        duplicates = org_vector_store.get_duplicates(min_similarity=min_similarity)
+        
+        # Only build response models for the requested page
+        end = offset + limit if limit is not None else None
+        return [DuplicatePair(**dup) for dup in duplicates[offset:end]]
         
     except HTTPException:
         raise
@@ -592,9 +661,55 @@ async def clear_all_data(organization_id: Optional[str] = None):
 
 
 # Merge endpoints
+class MergeDocument:
+    """Minimal document object (page_content + metadata) expected by the merge helpers."""
+    __slots__ = ("page_content", "metadata", "stored_metadata")
+    
+    def __init__(self, content, metadata, stored_metadata=None):
+        self.page_content = content
+        self.metadata = metadata
+        # Metadata as stored in the vector store, returned to the frontend as-is
+        self.stored_metadata = stored_metadata or {}
+
+
+def load_merge_documents(vs_service, pair_id: int):
+    """
+    Look up a duplicate pair and wrap both of its documents for the merge helpers.
+    
+    Args:
+        vs_service: Organization-specific vector store service
+        pair_id: ID of the duplicate pair
+        
+    Returns:
+        Tuple of (pair, main_doc, similar_doc)
+        
+    Raises:
+        HTTPException: 404 if the pair or either document cannot be found
+    """
+    target_pair = vs_service.get_duplicate_pair(pair_id)
+    if not target_pair:
+        raise HTTPException(status_code=404, detail=f"Duplicate pair {pair_id} not found")
+    
+    # Get full document content
+    main_doc_data = vs_service.get_document_by_metadata(target_pair['page1'])
+    similar_doc_data = vs_service.get_document_by_metadata(target_pair['page2'])
+    
+    if not main_doc_data or not similar_doc_data:
+        raise HTTPException(status_code=404, detail="Could not retrieve full document content")
+    
+    main_doc = MergeDocument(main_doc_data['content'], target_pair['page1'], main_doc_data['metadata'])
+    similar_doc = MergeDocument(similar_doc_data['content'], target_pair['page2'], similar_doc_data['metadata'])
+    return target_pair, main_doc, similar_doc
+
+
 @app.get("/merge/documents/{pair_id}")
-async def get_merge_documents(pair_id: int, organization_id: Optional[str] = None):
-    """Get full document content for a duplicate pair to enable merging."""
+async def get_merge_documents(pair_id: int, organization_id: Optional[str] = None, include_content: bool = True):
+    """
+    Get full document content for a duplicate pair to enable merging.
+    
+    Pass include_content=false to get only titles, URLs and similarity, and
+    fetch the (potentially large) page bodies when they are actually shown.
+    """
     start_time = time.time()
     log_api_request(f"/merge/documents/{pair_id}", "GET", organization_id=organization_id)
     
@@ -602,47 +717,47 @@ async def get_merge_documents(pair_id: int, organization_id: Optional[str] = Non
         # Get the organization-specific vector store
         vs_service = get_vector_store_for_organization(organization_id)
         
-        # Get the duplicate pair data
-        duplicate_pairs = vs_service.get_duplicate_pairs()
-        logger.debug(f"Found {len(duplicate_pairs)} duplicate pairs")
-        
-        # Find the specific pair
-        target_pair = None
-        for pair in duplicate_pairs:
-            if pair['id'] == pair_id:
-                target_pair = pair
-                break
-        
-        if not target_pair:
+        if not include_content:
+            # Titles and URLs live on the pair itself, so skip fetching the page bodies
+            target_pair = vs_service.get_duplicate_pair(pair_id)
+            if not target_pair:
+                raise HTTPException(status_code=404, detail=f"Duplicate pair {pair_id} not found")
+            
+            result = {
+                "main_doc": {
+                    "title": target_pair['page1']['title'],
+                    "url": target_pair['page1']['url'],
+                    "space": target_pair['page1'].get('space', '')
+                },
+                "similar_doc": {
+                    "title": target_pair['page2']['title'],
+                    "url": target_pair['page2']['url'],
+                    "space": target_pair['page2'].get('space', '')
+                },
+                "similarity": target_pair['similarity']
+            }
             duration_ms = (time.time() - start_time) * 1000
-            log_api_response(logger, f"/merge/documents/{pair_id}", 404, duration_ms)
-            raise HTTPException(status_code=404, detail=f"Duplicate pair {pair_id} not found")
+            log_api_response(logger, f"/merge/documents/{pair_id}", 200, duration_ms,
+                            similarity=target_pair['similarity'])
+            return result
         
+        target_pair, main_doc, similar_doc = load_merge_documents(vs_service, pair_id)
         logger.info(f"Found target pair: {target_pair['page1']['title']} <-> {target_pair['page2']['title']}")
         
-        # Get full document content from vector store
-        main_doc_data = vs_service.get_document_by_metadata(target_pair['page1'])
-        similar_doc_data = vs_service.get_document_by_metadata(target_pair['page2'])
-        
-        if not main_doc_data or not similar_doc_data:
-            duration_ms = (time.time() - start_time) * 1000
-            log_api_response(logger, f"/merge/documents/{pair_id}", 404, duration_ms)
-            raise HTTPException(status_code=404, detail="Could not retrieve full document content")
-        
         result = {
             "main_doc": {
                 "title": target_pair['page1']['title'],
                 "url": target_pair['page1']['url'],
                 "space": target_pair['page1'].get('space', ''),
-                "content": main_doc_data['content'],
-                "metadata": main_doc_data['metadata']
+                "content": main_doc.page_content,
+                "metadata": main_doc.stored_metadata
             },
             "similar_doc": {
                 "title": target_pair['page2']['title'],
                 "url": target_pair['page2']['url'],
                 "space": target_pair['page2'].get('space', ''),
-                "content": similar_doc_data['content'],
-                "metadata": similar_doc_data['metadata']
+                "content": similar_doc.page_content,
+                "metadata": similar_doc.stored_metadata
             },
             "similarity": target_pair['similarity']
         }
@@ -653,7 +768,9 @@ async def get_merge_documents(pair_id: int, organization_id: Optional[str] = Non
         
         return result
         
-    except HTTPException:
+    except HTTPException as e:
+        duration_ms = (time.time() - start_time) * 1000
+        log_api_response(logger, f"/merge/documents/{pair_id}", e.status_code, duration_ms)
         raise
     except Exception as e:
         duration_ms = (time.time() - start_time) * 1000
@@ -669,42 +786,39 @@ async def perform_merge(request: MergeRequest):
         # Get the organization-specific vector store
         vs_service = get_vector_store_for_organization(request.organization_id)
         
-        # Get the duplicate pair data
-        duplicate_pairs = vs_service.get_duplicate_pairs()
+        # Load both documents of the pair for the AI merge function
+        _, main_doc, similar_doc = load_merge_documents(vs_service, request.pair_id)
         
-        # Find the specific pair
-        target_pair = None
-        for pair in duplicate_pairs:
-            if pair['id'] == request.pair_id:
-                target_pair = pair
-                break
-        
-        if not target_pair:
-            raise HTTPException(status_code=404, detail=f"Duplicate pair {request.pair_id} not found")
-        
-        # Get full document content
-        main_doc_data = vs_service.get_document_by_metadata(target_pair['page1'])
-        similar_doc_data = vs_service.get_document_by_metadata(target_pair['page2'])
+        from ai.merging import merge_documents_with_ai
         
-        if not main_doc_data or not similar_doc_data:
-            raise HTTPException(status_code=404, detail="Could not retrieve full document content")
+        # Perform the AI merge
+        merged_content = merge_documents_with_ai(main_doc, similar_doc, use_cache=not request.regenerate)
         
-        # Create document objects for the AI merge function
-        from ai.merging import merge_documents_with_ai
+        return {"merged_content": merged_content}
         
-        # Create mock document objects that match the expected structure
-        class MockDocument:
-            def __init__(self, content, metadata):
-                self.page_content = content
-                self.metadata = metadata
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to perform merge: {str(e)}")
+
+
+@app.post("/merge/perform/stream")
+async def perform_merge_stream(request: MergeRequest):
+    """Perform AI-powered merge of two documents, streaming the merged text as it is generated."""
+    try:
+        # Get the organization-specific vector store
+        vs_service = get_vector_store_for_organization(request.organization_id)
         
-        main_doc = MockDocument(main_doc_data['content'], target_pair['page1'])
-        similar_doc = MockDocument(similar_doc_data['content'], target_pair['page2'])
+        # Load both documents of the pair for the AI merge function
+        _, main_doc, similar_doc = load_merge_documents(vs_service, request.pair_id)
         
-        # Perform the AI merge
-        merged_content = merge_documents_with_ai(main_doc, similar_doc)
+        from ai.merging import stream_merge_documents_with_ai
         
-        return {"merged_content": merged_content}
+        # The generator is iterated in a worker thread, so the event loop stays free
+        return StreamingResponse(
+            stream_merge_documents_with_ai(main_doc, similar_doc, use_cache=not request.regenerate),
+            media_type="text/plain; charset=utf-8"
+        )
         
     except HTTPException:
         raise
@@ -727,48 +841,16 @@ async def apply_merge(request: ApplyMergeRequest):
         # Get the organization-specific vector store
         vs_service = get_vector_store_for_organization(request.organization_id)
         
-        print(f"🔍 [APPLY_MERGE] Getting duplicate pairs...")
-        # Get the duplicate pair data
-        duplicate_pairs = vs_service.get_duplicate_pairs()
-        
-        print(f"🔍 [APPLY_MERGE] Found {len(duplicate_pairs)} duplicate pairs, looking for pair_id: {request.pair_id}")
-        # Find the specific pair
-        target_pair = None
-        for pair in duplicate_pairs:
-            if pair['id'] == request.pair_id:
-                target_pair = pair
-                break
-        
-        if not target_pair:
-            print(f"❌ [APPLY_MERGE] Target pair {request.pair_id} not found!")
-            raise HTTPException(status_code=404, detail=f"Duplicate pair {request.pair_id} not found")
-        
-        print(f"✅ [APPLY_MERGE] Found target pair: {target_pair}")
-        
-        print(f"🔍 [APPLY_MERGE] Getting document data...")
+        print(f"🔍 [APPLY_MERGE] Loading duplicate pair {request.pair_id} and its documents...")
         # Get full document content to create proper document objects
-        main_doc_data = vs_service.get_document_by_metadata(target_pair['page1'])
-        similar_doc_data = vs_service.get_document_by_metadata(target_pair['page2'])
-        
-        if not main_doc_data or not similar_doc_data:
-            print(f"❌ [APPLY_MERGE] Could not retrieve document data!")
-            raise HTTPException(status_code=404, detail="Could not retrieve full document content")
+        target_pair, main_doc, similar_doc = load_merge_documents(vs_service, request.pair_id)
         
-        print(f"✅ [APPLY_MERGE] Retrieved document data successfully")
+        print(f"✅ [APPLY_MERGE] Found target pair: {target_pair}")
         
         # Create document objects for the Confluence API
         print(f"🔍 [APPLY_MERGE] Importing Confluence API...")
         from confluence.api import apply_merge_to_confluence
         
-        print(f"🔍 [APPLY_MERGE] Creating document objects...")
-        class MockDocument:
-            def __init__(self, content, metadata):
-                self.page_content = content
-                self.metadata = metadata
-        
-        main_doc = MockDocument(main_doc_data['content'], target_pair['page1'])
-        similar_doc = MockDocument(similar_doc_data['content'], target_pair['page2'])
-        
         print(f"🔍 [APPLY_MERGE] Calling apply_merge_to_confluence with user_credentials...")
         # Apply the merge to Confluence
         success, message = apply_merge_to_confluence(
@@ -802,7 +884,6 @@ async def apply_merge(request: ApplyMergeRequest):
     except Exception as e:
         print(f"💥 [APPLY_MERGE] Unexpected error: {e}")
         print(f"💥 [APPLY_MERGE] Error type: {type(e).__name__}")
-        import traceback
         print(f"💥 [APPLY_MERGE] Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Failed to apply merge: {str(e)}")
 
@@ -855,7 +936,6 @@ async def process_documents_background(processing_id: str, request: ProcessingRe
         except Exception as vs_init_error:
             print(f"💥 [PROCESSING {processing_id}] Vector store initialization failed: {vs_init_error}")
             print(f"💥 [PROCESSING {processing_id}] Error type: {type(vs_init_error).__name__}")
-            import traceback
             print(f"💥 [PROCESSING {processing_id}] Traceback: {traceback.format_exc()}")
             processing_status[processing_id].update({
                 "status": "failed",
@@ -881,7 +961,6 @@ async def process_documents_background(processing_id: str, request: ProcessingRe
         except Exception as vs_error:
             print(f"💥 [PROCESSING {processing_id}] Vector store test error: {vs_error}")
             print(f"💥 [PROCESSING {processing_id}] Error type: {type(vs_error).__name__}")
-            import traceback
             print(f"💥 [PROCESSING {processing_id}] Traceback: {traceback.format_exc()}")
             processing_status[processing_id].update({
                 "status": "failed",
@@ -897,51 +976,67 @@ async def process_documents_background(processing_id: str, request: ProcessingRe
         
         print(f"📚 [PROCESSING {processing_id}] Loading documents from spaces: {request.space_keys}")
         
-        # Load documents from Confluence
-        load_success, documents, load_message = confluence_service.load_all_pages_from_spaces(
+        # Load documents from Confluence and index each space as soon as it arrives;
+        # the next space downloads while the current one is being embedded
+        documents_loaded = 0
+        spaces_loaded = 0
+        load_errors = []
+        space_batches = confluence_service.iter_pages_from_spaces(
             space_keys=request.space_keys,
             limit_per_space=request.limit_per_space
         )
-        
-        if not load_success:
-            print(f"❌ [PROCESSING {processing_id}] Document loading failed: {load_message}")
-            processing_status[processing_id].update({
-                "status": "failed",
-                "message": f"Document loading failed: {load_message}"
-            })
-            return
-        
-        print(f"✅ [PROCESSING {processing_id}] Loaded {len(documents)} documents from Confluence")
-        
-        processing_status[processing_id].update({
-            "documents_loaded": len(documents),
-            "message": f"Loaded {len(documents)} documents, adding to vector store..."
-        })
-        
-        # Add documents to vector store
-        print(f"💾 [PROCESSING {processing_id}] Adding {len(documents)} documents to vector store...")
         try:
-            add_success, add_message = org_vector_store.add_documents(documents)
-            
-            if not add_success:
-                print(f"❌ [PROCESSING {processing_id}] Vector store addition failed: {add_message}")
+            for space_key, documents, load_error in space_batches:
+                if load_error:
+                    print(f"⚠️ [PROCESSING {processing_id}] {load_error}")
+                    load_errors.append(load_error)
+                    processing_status[processing_id]["load_errors"] = list(load_errors)
+                    continue
+                if not documents:
+                    continue
+                
+                print(f"💾 [PROCESSING {processing_id}] Adding {len(documents)} documents from space {space_key} to vector store...")
+                add_success, add_message = org_vector_store.add_documents(documents)
+                
+                if not add_success:
+                    print(f"❌ [PROCESSING {processing_id}] Vector store addition failed: {add_message}")
+                    processing_status[processing_id].update({
+                        "status": "failed",
+                        "message": f"Vector store addition failed: {add_message}"
+                    })
+                    return
+                
+                documents_loaded += len(documents)
+                spaces_loaded += 1
                 processing_status[processing_id].update({
-                    "status": "failed",
-                    "message": f"Vector store addition failed: {add_message}"
+                    "documents_loaded": documents_loaded,
+                    "message": f"Indexed {documents_loaded} documents from {spaces_loaded} of {len(request.space_keys)} spaces..."
                 })
-                return
-            
-            print(f"✅ [PROCESSING {processing_id}] Documents successfully added to vector store: {add_message}")
         except Exception as add_error:
             print(f"💥 [PROCESSING {processing_id}] Vector store addition error: {add_error}")
             print(f"💥 [PROCESSING {processing_id}] Error type: {type(add_error).__name__}")
-            import traceback
             print(f"💥 [PROCESSING {processing_id}] Traceback: {traceback.format_exc()}")
             processing_status[processing_id].update({
                 "status": "failed",
                 "message": f"Vector store addition error: {add_error}"
             })
             return
+        finally:
+            # Stop the loader (and its prefetch thread) if we left the loop early
+            space_batches.close()
+        
+        if documents_loaded == 0:
+            load_message = '; '.join(load_errors[:3]) if load_errors else "No documents found in the selected spaces"
+            print(f"❌ [PROCESSING {processing_id}] Document loading failed: {load_message}")
+            processing_status[processing_id].update({
+                "status": "failed",
+                "message": f"Document loading failed: {load_message}"
+            })
+            return
+        
+        print(f"✅ [PROCESSING {processing_id}] Loaded and indexed {documents_loaded} documents from Confluence")
+        if load_errors:
+            print(f"⚠️ [PROCESSING {processing_id}] {len(load_errors)} spaces failed to load: {'; '.join(load_errors[:3])}")
         
         # Check vector store status after adding
         try:
@@ -965,9 +1060,13 @@ async def process_documents_background(processing_id: str, request: ProcessingRe
         
         if scan_success:
             print(f"✅ [PROCESSING {processing_id}] Duplicate scan completed successfully")
+            # Spaces that failed to load are reported in load_errors; the run itself completed
+            completion_message = "Processing completed successfully"
+            if load_errors:
+                completion_message = f"Processing completed; {len(load_errors)} of {len(request.space_keys)} spaces failed to load"
             processing_status[processing_id].update({
                 "status": "completed",
-                "message": "Processing completed successfully",
+                "message": completion_message,
                 "duplicates_found": scan_results.get('pairs_found', 0),
                 "documents_updated": scan_results.get('documents_updated', 0),
                 "completed_at": datetime.now(timezone.utc).isoformat()
@@ -982,7 +1081,6 @@ async def process_documents_background(processing_id: str, request: ProcessingRe
     except Exception as e:
         print(f"💥 [PROCESSING {processing_id}] CRITICAL ERROR: {str(e)}")
         print(f"💥 [PROCESSING {processing_id}] Error type: {type(e).__name__}")
-        import traceback
         print(f"💥 [PROCESSING {processing_id}] Traceback: {traceback.format_exc()}")
         
         processing_status[processing_id].update({
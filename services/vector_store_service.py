@@ -60,36 +60,63 @@ class VectorStoreService:
         except ImportError:
             raise ImportError("langchain_openai is required. Install with: pip install langchain-openai")
     
+    def _open_collections(self, client_settings=None):
+        """
+        Open the document collection and the duplicate-pair cache collection.
+        
+        Args:
+            client_settings: Optional chromadb Settings to pass to both collections
+        """
+        from langchain_chroma import Chroma
+        
+        extra_kwargs = {'client_settings': client_settings} if client_settings is not None else {}
+        
+        self.db = Chroma(
+            persist_directory=self.chroma_persist_dir,
+            embedding_function=self.embeddings,
+            collection_name=self.collection_name,
+            **extra_kwargs
+        )
+        
+        # Initialize separate cache collection for duplicate pairs
+        self.cache_db = Chroma(
+            persist_directory=self.chroma_persist_dir,
+            embedding_function=self.embeddings,
+            collection_name=self.cache_collection_name,
+            **extra_kwargs
+        )
+    
+    @staticmethod
+    def _count_records(store) -> int:
+        """
+        Return the number of records in a Chroma store without fetching them.
+        
+        langchain_chroma exposes no count of its own, and store.get() loads
+        every id and metadata row just to take len(). The underlying chromadb
+        collection is only reachable as store._collection; this is the one
+        place that touches it, so a langchain_chroma upgrade that renames the
+        attribute needs fixing here only.
+        """
+        return store._collection.count()
+    
+    @staticmethod
+    def _production_settings():
+        """Chroma client settings used for production compatibility (tenant validation disabled)."""
+        import chromadb
+        settings = chromadb.config.Settings()
+        settings.allow_reset = True
+        return settings
+    
     def _init_database(self):
         """Initialize ChromaDB instance with organization-specific collection."""
         try:
-            from langchain_chroma import Chroma
-            import os
-            
             # Ensure the persist directory exists
             if not os.path.exists(self.chroma_persist_dir):
                 print(f"📁 [VECTOR_STORE] Creating ChromaDB directory: {self.chroma_persist_dir}")
                 os.makedirs(self.chroma_persist_dir, exist_ok=True)
             
             # For production compatibility, disable tenant validation
-            import chromadb
-            settings = chromadb.config.Settings()
-            settings.allow_reset = True
-            
-            self.db = Chroma(
-                persist_directory=self.chroma_persist_dir,
-                embedding_function=self.embeddings,
-                collection_name=self.collection_name,
-                client_settings=settings
-            )
-            
-            # Initialize separate cache collection for duplicate pairs
-            self.cache_db = Chroma(
-                persist_directory=self.chroma_persist_dir,
-                embedding_function=self.embeddings,
-                collection_name=self.cache_collection_name,
-                client_settings=settings
-            )
+            self._open_collections(self._production_settings())
             
             print(f"🗄️ [VECTOR_STORE] Initialized ChromaDB with collection: {self.collection_name}")
             print(f"🗄️ [VECTOR_STORE] Initialized cache collection: {self.cache_collection_name}")
@@ -103,25 +130,7 @@ class VectorStoreService:
                 try:
                     self._clear_chroma_directory()
                     # Try again after clearing
-                    from langchain_chroma import Chroma
-                    import chromadb
-                    settings = chromadb.config.Settings()
-                    settings.allow_reset = True
-                    
-                    self.db = Chroma(
-                        persist_directory=self.chroma_persist_dir,
-                        embedding_function=self.embeddings,
-                        collection_name=self.collection_name,
-                        client_settings=settings
-                    )
-                    
-                    # Initialize separate cache collection for duplicate pairs
-                    self.cache_db = Chroma(
-                        persist_directory=self.chroma_persist_dir,
-                        embedding_function=self.embeddings,
-                        collection_name=self.cache_collection_name,
-                        client_settings=settings
-                    )
+                    self._open_collections(self._production_settings())
                     
                     print(f"✅ [VECTOR_STORE] Successfully reinitialized after clearing: {self.collection_name}")
                     print(f"✅ [VECTOR_STORE] Successfully reinitialized cache collection: {self.cache_collection_name}")
@@ -131,19 +140,7 @@ class VectorStoreService:
             
             # Fallback: Use simpler client configuration
             try:
-                from langchain_chroma import Chroma
-                self.db = Chroma(
-                    persist_directory=self.chroma_persist_dir,
-                    embedding_function=self.embeddings,
-                    collection_name=self.collection_name
-                )
-                
-                # Initialize separate cache collection for duplicate pairs
-                self.cache_db = Chroma(
-                    persist_directory=self.chroma_persist_dir,
-                    embedding_function=self.embeddings,
-                    collection_name=self.cache_collection_name
-                )
+                self._open_collections()
                 
                 print(f"🗄️ [VECTOR_STORE] Initialized ChromaDB with fallback config: {self.collection_name}")
                 print(f"🗄️ [VECTOR_STORE] Initialized cache collection with fallback config: {self.cache_collection_name}")
@@ -199,7 +196,7 @@ class VectorStoreService:
                 return False, "Embedding generation failed"
             
             # Test ChromaDB connection
-            collection_count = len(self.db.get()['ids'])
+            collection_count = self._count_records(self.db)
             
             return True, f"Vector store connected successfully. Collection: {self.collection_name}, Documents: {collection_count}, Embedding dimension: {len(embedding)}"
             
@@ -231,23 +228,14 @@ class VectorStoreService:
             
             # Now it's safe to test basic ChromaDB connection
             try:
-                # Safely get collection info
-                db_result = self.db.get()
-                if db_result and 'ids' in db_result:
-                    collection_count = len(db_result['ids'])
-                else:
-                    collection_count = 0
+                collection_count = self._count_records(self.db)
             except Exception as db_error:
                 # If we can't get the count, there's a real connection issue
                 return False, f"ChromaDB collection error: {str(db_error)}"
                 
             try:
                 # Safely get cache info
-                cache_result = self.cache_db.get()
-                if cache_result and 'ids' in cache_result:
-                    cache_count = len(cache_result['ids'])
-                else:
-                    cache_count = 0
+                cache_count = self._count_records(self.cache_db)
             except Exception as cache_error:
                 # Cache errors are less critical
                 cache_count = 0
@@ -278,6 +266,7 @@ class VectorStoreService:
             
             total_docs = len(documents)
             added_count = 0
+            unchanged_count = 0
             
             # Process documents in batches for efficiency
             for i in range(0, total_docs, batch_size):
@@ -294,13 +283,36 @@ class VectorStoreService:
                         doc.metadata['doc_id'] = doc_id
                     doc_ids.append(doc_id)
                 
+                # Skip pages that are already stored with the same title, URL and content:
+                # they need no new embedding and cannot change the duplicate pairs
+                existing = self.db.get(ids=doc_ids, include=['documents', 'metadatas'])
+                stored = {
+                    stored_id: (stored_content, stored_metadata or {})
+                    for stored_id, stored_content, stored_metadata in zip(existing['ids'], existing['documents'], existing['metadatas'])
+                }
+                changed_docs = []
+                changed_ids = []
+                for doc, doc_id in zip(batch, doc_ids):
+                    stored_content, stored_metadata = stored.get(doc_id, (None, {}))
+                    if (stored_content == doc.page_content
+                            and stored_metadata.get('title') == doc.metadata.get('title')
+                            and stored_metadata.get('source') == doc.metadata.get('source')):
+                        unchanged_count += 1
+                        continue
+                    changed_docs.append(doc)
+                    changed_ids.append(doc_id)
+                
+                if not changed_docs:
+                    print(f"Skipped batch {i//batch_size + 1}/{(total_docs + batch_size - 1)//batch_size}: all {len(batch)} documents unchanged")
+                    continue
+                
                 # Add batch to ChromaDB (this will overwrite existing documents with same IDs)
-                self.db.add_documents(batch, ids=doc_ids)
-                added_count += len(batch)
+                self.db.add_documents(changed_docs, ids=changed_ids)
+                added_count += len(changed_docs)
                 
-                print(f"Added batch {i//batch_size + 1}/{(total_docs + batch_size - 1)//batch_size}: {len(batch)} documents")
+                print(f"Added batch {i//batch_size + 1}/{(total_docs + batch_size - 1)//batch_size}: {len(changed_docs)} documents ({len(batch) - len(changed_docs)} unchanged)")
             
-            return True, f"Successfully added {added_count} documents to vector store"
+            return True, f"Successfully added {added_count} documents to vector store ({unchanged_count} unchanged)"
             
         except Exception as e:
             return False, f"Error adding documents to vector store: {str(e)}"
@@ -308,7 +320,7 @@ class VectorStoreService:
     def get_document_count(self) -> int:
         """Get total number of documents in the vector store."""
         try:
-            return len(self.db.get()['ids'])
+            return self._count_records(self.db)
         except Exception:
             return 0
     
@@ -322,18 +334,19 @@ class VectorStoreService:
         try:
             # Try to get count from cached duplicate pairs first
             try:
-                cached_pairs = self.db.get(where={"doc_type": "duplicate_pair"})
-                if cached_pairs['documents']:
-                    count = len(cached_pairs['documents'])
+                # Pairs live in the cache collection; only their ids are needed to count them
+                cached_pairs = self.cache_db.get(where={"doc_type": "duplicate_pair"}, include=[])
+                if cached_pairs['ids']:
+                    count = len(cached_pairs['ids'])
                     print(f"🚀 [DUPLICATE_COUNT] Found {count} cached duplicate pairs")
                     return count
             except Exception as e:
                 print(f"⚠️ [DUPLICATE_COUNT] No cached pairs, falling back to metadata scan: {e}")
             
             # Fallback to original method
-            all_docs = self.db.get()
+            all_docs = self.db.get(include=['metadatas'])
             
-            if not all_docs['documents']:
+            if not all_docs['metadatas']:
                 return 0
             
             # Count unique pairs by looking at similar_docs metadata
@@ -367,8 +380,8 @@ class VectorStoreService:
             Tuple of (success, message)
         """
         try:
-            # Get all document IDs from main collection
-            all_docs = self.db.get()
+            # Get all document IDs from main collection (ids only, no text or metadata)
+            all_docs = self.db.get(include=[])
             docs_cleared = 0
             
             if all_docs['ids']:
@@ -377,7 +390,7 @@ class VectorStoreService:
             
             # Also clear the cache collection
             try:
-                cache_docs = self.cache_db.get()
+                cache_docs = self.cache_db.get(include=[])
                 cache_cleared = 0
                 if cache_docs['ids']:
                     self.cache_db.delete(cache_docs['ids'])
@@ -411,8 +424,8 @@ class VectorStoreService:
             Tuple of (success, results_dict)
         """
         try:
-            # Get all documents from ChromaDB
-            all_docs = self.db.get()
+            # Get all documents from ChromaDB, including the embeddings stored at ingestion
+            all_docs = self.db.get(include=['documents', 'metadatas', 'embeddings'])
             
             if not all_docs['documents'] or len(all_docs['documents']) < 2:
                 return True, {
@@ -424,7 +437,10 @@ class VectorStoreService:
             
             print(f"Scanning {len(all_docs['documents'])} documents for duplicates...")
             
-            # Generate embeddings for all documents
+            # Collect embeddings for all documents
+            stored_embeddings = all_docs.get('embeddings')
+            if stored_embeddings is None:
+                stored_embeddings = []
             doc_embeddings = []
             valid_docs = []
             
@@ -433,8 +449,13 @@ class VectorStoreService:
                     # Skip documents that are too short
                     if len(doc_content.strip()) < 50:
                         continue
-                        
-                    embedding = self.embeddings.embed_query(doc_content)
+                    
+                    # Reuse the embedding Chroma already holds for this document; only
+                    # documents without one go back to the embeddings API
+                    if i < len(stored_embeddings) and stored_embeddings[i] is not None:
+                        embedding = stored_embeddings[i]
+                    else:
+                        embedding = self.embeddings.embed_query(doc_content)
                     doc_embeddings.append(embedding)
                     valid_docs.append(i)
                 except Exception as e:
@@ -454,40 +475,44 @@ class VectorStoreService:
             embedding_matrix = np.array(doc_embeddings)
             similarity_matrix = cosine_similarity(embedding_matrix)
             
-            # Find similar document pairs above threshold
+            # Find similar document pairs above threshold. Thresholding the upper
+            # triangle in numpy yields only the candidate pairs, so the Python loop
+            # below runs once per match instead of once per N² cell.
+            pair_rows, pair_cols = np.nonzero(np.triu(similarity_matrix >= similarity_threshold, k=1))
+
+            # Resolve each document's id once rather than once per pair it appears in
+            all_metadatas = all_docs['metadatas']
+            doc_ids = [metadata.get('doc_id', f'doc_{idx}') for idx, metadata in enumerate(all_metadatas)]
+
             similar_pairs = []
             similar_docs_metadata = {}
-            
-            for i in range(len(valid_docs)):
-                for j in range(i + 1, len(valid_docs)):
-                    similarity_score = similarity_matrix[i][j]
-                    if similarity_score >= similarity_threshold:
-                        doc_i_idx = valid_docs[i]
-                        doc_j_idx = valid_docs[j]
-                        
-                        title_i = all_docs['metadatas'][doc_i_idx].get('title', f'Document {doc_i_idx+1}')
-                        title_j = all_docs['metadatas'][doc_j_idx].get('title', f'Document {doc_j_idx+1}')
-                        
-                        similar_pairs.append((doc_i_idx, doc_j_idx, similarity_score))
-                        print(f"Found similar pair: '{title_i}' ↔ '{title_j}' (similarity: {similarity_score:.3f})")
-                        
-                        # Build similarity metadata
-                        doc_i_id = all_docs['metadatas'][doc_i_idx].get('doc_id', f'doc_{doc_i_idx}')
-                        doc_j_id = all_docs['metadatas'][doc_j_idx].get('doc_id', f'doc_{doc_j_idx}')
-                        
-                        if doc_i_id not in similar_docs_metadata:
-                            similar_docs_metadata[doc_i_id] = []
-                        if doc_j_id not in similar_docs_metadata:
-                            similar_docs_metadata[doc_j_id] = []
-                        
-                        similar_docs_metadata[doc_i_id].append(doc_j_id)
-                        similar_docs_metadata[doc_j_id].append(doc_i_id)
+
+            for i, j in zip(pair_rows.tolist(), pair_cols.tolist()):
+                similarity_score = float(similarity_matrix[i, j])
+                doc_i_idx = valid_docs[i]
+                doc_j_idx = valid_docs[j]
+
+                title_i = all_metadatas[doc_i_idx].get('title', f'Document {doc_i_idx+1}')
+                title_j = all_metadatas[doc_j_idx].get('title', f'Document {doc_j_idx+1}')
+
+                similar_pairs.append((doc_i_idx, doc_j_idx, similarity_score))
+                print(f"Found similar pair: '{title_i}' ↔ '{title_j}' (similarity: {similarity_score:.3f})")
+
+                # Build similarity metadata
+                doc_i_id = doc_ids[doc_i_idx]
+                doc_j_id = doc_ids[doc_j_idx]
+
+                similar_docs_metadata.setdefault(doc_i_id, []).append(doc_j_id)
+                similar_docs_metadata.setdefault(doc_j_id, []).append(doc_i_id)
             
             # Update documents with new similarity relationships
             documents_to_update = []
+            all_ids = all_docs['ids']
+            all_documents = all_docs['documents']
+            scan_time = datetime.now(timezone.utc).isoformat()
             
-            for i, metadata in enumerate(all_docs['metadatas']):
-                doc_id = metadata.get('doc_id', f'doc_{i}')
+            for i, metadata in enumerate(all_metadatas):
+                doc_id = doc_ids[i]
                 current_similar_docs = metadata.get('similar_docs', '')
                 
                 # Determine new similar_docs value
@@ -501,11 +526,11 @@ class VectorStoreService:
                     updated_metadata = metadata.copy()
                     updated_metadata['similar_docs'] = new_similar_docs
                     updated_metadata['doc_id'] = doc_id
-                    updated_metadata['last_similarity_scan'] = datetime.now(timezone.utc).isoformat()
+                    updated_metadata['last_similarity_scan'] = scan_time
                     
                     documents_to_update.append({
-                        'id': all_docs['ids'][i],
-                        'document': all_docs['documents'][i],
+                        'id': all_ids[i],
+                        'document': all_documents[i],
                         'metadata': updated_metadata
                     })
             
@@ -537,8 +562,10 @@ class VectorStoreService:
                         'threshold_used': similarity_threshold
                     }
             
-            # Cache duplicate pairs for fast retrieval
+            # Cache duplicate pairs for fast retrieval, strongest first so that pair ids
+            # rank by similarity and a page of results is always the top of the list
             if similar_pairs:
+                similar_pairs.sort(key=lambda pair: pair[2], reverse=True)
                 self._cache_duplicate_pairs(similar_pairs, all_docs)
             
             return True, {
@@ -557,6 +584,15 @@ class VectorStoreService:
                 'threshold_used': similarity_threshold
             }
     
+    @staticmethod
+    def _page_summary(metadata: Dict[str, Any], default_title: str) -> Dict[str, str]:
+        """Build the title/url/space view of a document used in duplicate pair payloads."""
+        return {
+            'title': metadata.get('title', default_title),
+            'url': metadata.get('source', ''),
+            'space': metadata.get('space_name', metadata.get('space_key', 'Unknown'))
+        }
+    
     def _cache_duplicate_pairs(self, similar_pairs, all_docs):
         """
         Cache duplicate pairs for fast retrieval.
@@ -575,24 +611,15 @@ class VectorStoreService:
             # Cache new pairs
             from langchain.schema import Document
             cached_documents = []
+            all_metadatas = all_docs['metadatas']
+            cached_at = datetime.now(timezone.utc).isoformat()
             
             for i, (doc_i_idx, doc_j_idx, similarity_score) in enumerate(similar_pairs):
-                metadata_i = all_docs['metadatas'][doc_i_idx]
-                metadata_j = all_docs['metadatas'][doc_j_idx]
-                
                 # Create duplicate pair data structure
                 pair_data = {
                     'id': i + 1,
-                    'page1': {
-                        'title': metadata_i.get('title', f'Document {doc_i_idx+1}'),
-                        'url': metadata_i.get('source', ''),
-                        'space': metadata_i.get('space_name', metadata_i.get('space_key', 'Unknown'))
-                    },
-                    'page2': {
-                        'title': metadata_j.get('title', f'Document {doc_j_idx+1}'),
-                        'url': metadata_j.get('source', ''),
-                        'space': metadata_j.get('space_name', metadata_j.get('space_key', 'Unknown'))
-                    },
+                    'page1': self._page_summary(all_metadatas[doc_i_idx], f'Document {doc_i_idx+1}'),
+                    'page2': self._page_summary(all_metadatas[doc_j_idx], f'Document {doc_j_idx+1}'),
                     'similarity': round(similarity_score, 3),
                     'status': 'pending'
                 }
@@ -604,7 +631,7 @@ class VectorStoreService:
                         'doc_type': 'duplicate_pair',
                         'pair_id': i + 1,
                         'similarity': similarity_score,
-                        'cached_at': datetime.now(timezone.utc).isoformat()
+                        'cached_at': cached_at
                     }
                 ))
             
@@ -615,12 +642,15 @@ class VectorStoreService:
         except Exception as e:
             print(f"❌ [CACHE] Error caching duplicate pairs: {e}")
     
-    def get_duplicates(self) -> List[Dict[str, Any]]:
+    def get_duplicates(self, min_similarity: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         Get all detected duplicate pairs from the vector store.
         Fast implementation using cached duplicate pairs.
         Filters out resolved pairs so they don't appear in Content Report.
         
+        Args:
+            min_similarity: Optional minimum similarity score; weaker pairs are dropped
+        
         Returns:
             List of duplicate pair dictionaries (only pending status)
         """
@@ -630,8 +660,14 @@ class VectorStoreService:
                 cached_pairs = self.cache_db.get(where={"doc_type": "duplicate_pair"})
                 if cached_pairs['documents']:
                     all_pairs = [eval(doc) for doc in cached_pairs['documents']]
-                    # Filter out resolved pairs
-                    pending_pairs = [pair for pair in all_pairs if pair.get('status', 'pending') != 'resolved']
+                    # Chroma does not guarantee read order; restore the ranked pair order
+                    all_pairs.sort(key=lambda pair: pair.get('id', 0))
+                    # Filter out resolved pairs (and weaker pairs, if asked) in a single pass
+                    pending_pairs = [
+                        pair for pair in all_pairs
+                        if pair.get('status', 'pending') != 'resolved'
+                        and (min_similarity is None or pair.get('similarity', 0) >= min_similarity)
+                    ]
                     print(f"🚀 [DUPLICATES] Found {len(pending_pairs)} pending duplicate pairs (filtered out {len(all_pairs) - len(pending_pairs)} resolved)")
                     return pending_pairs
             except Exception as e:
@@ -645,6 +681,14 @@ class VectorStoreService:
             
             duplicate_pairs = []
             processed_pairs = set()
+            pair_count = 0
+            
+            # Resolve every document's id once and index them, so each similar_docs
+            # reference is a dict lookup instead of a scan over the whole collection
+            doc_ids = [metadata.get('doc_id', f'doc_{idx}') for idx, metadata in enumerate(all_docs['metadatas'])]
+            id_to_index = {}
+            for idx, doc_id in enumerate(doc_ids):
+                id_to_index.setdefault(doc_id, idx)
             
             for i, metadata in enumerate(all_docs['metadatas']):
                 # Skip duplicate pair documents
@@ -660,17 +704,12 @@ class VectorStoreService:
                 
                 for similar_id in similar_doc_ids:
                     # Find the similar document
-                    similar_idx = None
-                    for j, other_metadata in enumerate(all_docs['metadatas']):
-                        if other_metadata.get('doc_id', f'doc_{j}') == similar_id:
-                            similar_idx = j
-                            break
-                    
+                    similar_idx = id_to_index.get(similar_id)
                     if similar_idx is None:
                         continue
                     
                     # Create a unique pair identifier to avoid duplicates
-                    doc1_id = metadata.get('doc_id', f'doc_{i}')
+                    doc1_id = doc_ids[i]
                     doc2_id = similar_id
                     pair_key = tuple(sorted([doc1_id, doc2_id]))
                     
@@ -700,19 +739,16 @@ class VectorStoreService:
                         print(f"Warning: Could not calculate similarity for pair {doc1_id}-{doc2_id}: {e}")
                         similarity = 0.75  # Default fallback
                     
+                    # Pair ids count every pair so resolved markers keep matching,
+                    # but weaker pairs are dropped before their dict is built
+                    pair_count += 1
+                    if min_similarity is not None and similarity < min_similarity:
+                        continue
+                    
                     duplicate_pairs.append({
-                        "id": len(duplicate_pairs) + 1,
-                        "page1": {
-                            "title": metadata.get('title', 'Unknown'),
-                            "url": metadata.get('source', ''),
-                            "space": metadata.get('space_name', metadata.get('space_key', 'Unknown'))
-                        },
-                        "page2": {
-                            "title": all_docs['metadatas'][similar_idx].get('title', 'Unknown'), 
-                            "url": all_docs['metadatas'][similar_idx].get('source', ''),
-                            "space": all_docs['metadatas'][similar_idx].get('space_name', 
-                                   all_docs['metadatas'][similar_idx].get('space_key', 'Unknown'))
-                        },
+                        "id": pair_count,
+                        "page1": self._page_summary(metadata, 'Unknown'),
+                        "page2": self._page_summary(all_docs['metadatas'][similar_idx], 'Unknown'),
                         "similarity": round(similarity, 3),
                         "status": "pending"
                     })
@@ -752,6 +788,39 @@ class VectorStoreService:
         """
         return self.get_duplicates()
 
+    def get_duplicate_pair(self, pair_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a single pending duplicate pair by ID.
+        Looks the pair up by its cached pair_id instead of loading every pair.
+        
+        Args:
+            pair_id: ID of the duplicate pair
+            
+        Returns:
+            Duplicate pair dictionary, or None if it does not exist or is resolved
+        """
+        try:
+            cached = self.cache_db.get(
+                where={"$and": [{"doc_type": "duplicate_pair"}, {"pair_id": pair_id}]},
+                include=['documents']
+            )
+            if cached['documents']:
+                pair = eval(cached['documents'][0])
+                return None if pair.get('status', 'pending') == 'resolved' else pair
+            
+            # The pair cache exists but has no such pair
+            any_cached = self.cache_db.get(where={"doc_type": "duplicate_pair"}, limit=1, include=[])
+            if any_cached['ids']:
+                return None
+        except Exception as e:
+            print(f"⚠️ [DUPLICATES] Cached pair lookup failed, falling back to full scan: {e}")
+        
+        # No cached pairs yet: fall back to the metadata scan
+        for pair in self.get_duplicates():
+            if pair['id'] == pair_id:
+                return pair
+        return None
+    
     def mark_pair_as_resolved(self, pair_id: int) -> bool:
         """
         Mark a duplicate pair as resolved so it won't appear in future duplicate reports.
@@ -829,34 +898,43 @@ class VectorStoreService:
             Dictionary with content and metadata, or None if not found
         """
         try:
-            all_docs = self.db.get()
+            target_title = page_metadata.get('title', '').strip()
+            target_url = page_metadata.get('url', '').strip()
+            
+            # Let Chroma filter on the title instead of pulling the whole collection;
+            # fall back to a full scan only when the exact title is not stored as-is
+            all_docs = None
+            if target_title:
+                all_docs = self.db.get(where={"title": target_title}, include=['documents', 'metadatas'])
+            if not all_docs or not all_docs['documents']:
+                all_docs = self.db.get(include=['documents', 'metadatas'])
             
             if not all_docs['documents']:
                 return None
             
-            target_title = page_metadata.get('title', '').strip()
-            target_url = page_metadata.get('url', '').strip()
-            
-            # Try to find by exact title and URL match first
+            # Single pass: return as soon as title and URL both match, remembering the
+            # first title-only match as a fallback
+            title_match_idx = None
             for i, metadata in enumerate(all_docs['metadatas']):
                 doc_title = metadata.get('title', '').strip()
-                doc_url = metadata.get('source', '').strip()
+                if doc_title != target_title:
+                    continue
                 
-                if doc_title == target_title and doc_url == target_url:
+                if metadata.get('source', '').strip() == target_url:
                     return {
                         'content': all_docs['documents'][i],
                         'metadata': metadata
                     }
-            
-            # Fallback: try to find by title only
-            for i, metadata in enumerate(all_docs['metadatas']):
-                doc_title = metadata.get('title', '').strip()
                 
-                if doc_title == target_title:
-                    return {
-                        'content': all_docs['documents'][i],
-                        'metadata': metadata
-                    }
+                if title_match_idx is None:
+                    title_match_idx = i
+            
+            # Fallback: first document with the same title
+            if title_match_idx is not None:
+                return {
+                    'content': all_docs['documents'][title_match_idx],
+                    'metadata': all_docs['metadatas'][title_match_idx]
+                }
             
             print(f"⚠️ [DOCUMENT LOOKUP] Could not find document with title: {target_title}")
             return None
@@ -881,7 +959,10 @@ class VectorStoreConfig:
         try:
             import sys
             from pathlib import Path
-            sys.path.append(str(Path(__file__).parent.parent))
+            # Called once per organization's service; only add the project root once
+            project_root = str(Path(__file__).parent.parent)
+            if project_root not in sys.path:
+                sys.path.append(project_root)
             from config.environment import config
             
             chroma_persist_dir = config.chroma_persist_directory
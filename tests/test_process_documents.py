@@ -0,0 +1,109 @@
+"""
+Tests for the background document processing job in services.main.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# The service module pulls in the full backend stack
+pytest.importorskip("fastapi")
+pytest.importorskip("langchain_community")
+pytest.importorskip("langchain_chroma")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services import main  # noqa: E402
+
+
+class RecordingIterator:
+    """Wraps the space iterator and records whether the job closed it."""
+
+    def __init__(self, iterator):
+        self._iterator = iterator
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        self.closed = True
+        self._iterator.close()
+
+
+class FakeConfluenceService(main.ConfluenceService):
+    """Real space iteration over a loader that fails for the BAD space."""
+
+    last_batches = None
+
+    def test_connection(self):
+        return True, "ok"
+
+    def _load_space_pages(self, space_key, limit_per_space=None):
+        if space_key == "BAD":
+            raise RuntimeError("boom")
+        return [f"{space_key} page"]
+
+    def get_space_name_from_key(self, space_key):
+        return space_key
+
+    def iter_pages_from_spaces(self, space_keys, limit_per_space=None):
+        batches = RecordingIterator(super().iter_pages_from_spaces(space_keys, limit_per_space))
+        FakeConfluenceService.last_batches = batches
+        return batches
+
+
+class FakeVectorStore:
+    def __init__(self, add_success=True):
+        self.add_success = add_success
+
+    def test_connection(self):
+        return True, "ok"
+
+    def get_document_count(self):
+        return 0
+
+    def add_documents(self, documents):
+        return self.add_success, "added" if self.add_success else "write failed"
+
+    def scan_for_duplicates(self, similarity_threshold, update_existing=True):
+        return True, {'pairs_found': 1, 'documents_updated': 2}
+
+
+def run_job(monkeypatch, vector_store):
+    monkeypatch.setattr(main, "ConfluenceService", FakeConfluenceService)
+    monkeypatch.setattr(main, "get_vector_store_for_organization", lambda organization_id=None: vector_store)
+
+    processing_id = "proc_test"
+    main.processing_status[processing_id] = {"status": "starting"}
+    request = main.ProcessingRequest(
+        credentials=main.ConfluenceCredentials(
+            base_url="https://example.atlassian.net/wiki",
+            username="user@example.com",
+            api_token="token"
+        ),
+        space_keys=["GOOD", "BAD", "OTHER"]
+    )
+    asyncio.run(main.process_documents_background(processing_id, request))
+    return main.processing_status.pop(processing_id)
+
+
+def test_failed_space_is_reported_without_failing_the_run(monkeypatch):
+    status = run_job(monkeypatch, FakeVectorStore())
+
+    assert status["status"] == "completed"
+    assert status["load_errors"] == ["Error loading from space BAD: boom"]
+    assert status["documents_loaded"] == 2
+    assert status["duplicates_found"] == 1
+    assert FakeConfluenceService.last_batches.closed
+
+
+def test_space_iterator_is_closed_when_indexing_stops_early(monkeypatch):
+    status = run_job(monkeypatch, FakeVectorStore(add_success=False))
+
+    assert status["status"] == "failed"
+    assert FakeConfluenceService.last_batches.closed